@@ -8,84 +8,238 @@ Script for collecting Docker resource information on remote servers.
 import os
 import sys
 import time
+import queue
+import logging
+import logging.handlers
 import datetime
+import shutil
+import importlib.util
 import argparse
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from server_info import ServerInfo
+from server_info import ServerInfo, CONNECT_TIMEOUT
+from ssh_pool import SSHPool
 from formatters import format_output
 
 # Default settings
 DEFAULT_SERVERS_FILE = "servers.txt"
 DEFAULT_OUTPUT_FORMAT = "text"
-DEFAULT_TIMEOUT = 5  # Server connection timeout in seconds
-MAX_WORKERS = 10  # Maximum number of parallel connections
+DEFAULT_TIMEOUT = CONNECT_TIMEOUT  # Server connection timeout in seconds
+MAX_WORKERS = 64  # Upper limit for the default number of parallel connections
+WORKERS_PER_CPU = 4  # Workers mostly wait on SSH I/O, so several per core are useful
+ASYNC_MAX_CONNECTIONS = 256  # Default limit of concurrent connections for the asyncssh backend
 
-def read_servers_file(file_path):
-    """Read file with server list."""
-    servers = []
+logger = logging.getLogger('docker_resources')
+
+def setup_logging():
+    """Configure progress messages to be written to stdout by a background listener.
+    
+    Worker threads only put records on a queue and never wait for the terminal.
+    Returns the queue handler and the started listener.
+    """
+    log_queue = queue.Queue(-1)
+    
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter('%(message)s'))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    logger.addHandler(queue_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
     
-    if not os.path.exists(file_path):
-        print(f"Error: File {file_path} not found.")
-        print("Create a file in the format: user@hostname or hostname (one per line)")
+    listener.start()
+    return queue_handler, listener
+
+def read_servers_file(file_path):
+    """Read file with server list (duplicate entries are dropped)."""
+    try:
+        f = open(file_path, 'r')
+    except FileNotFoundError:
+        logger.error(f"Error: File {file_path} not found.")
+        logger.error("Create a file in the format: user@hostname or hostname (one per line)")
         sys.exit(1)
     
-    with open(file_path, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#'):
-                servers.append(line)
+    with f:
+        # dict.fromkeys keeps the first occurrence of each server in file order
+        servers = list(dict.fromkeys(
+            line for line in (raw_line.strip() for raw_line in f)
+            if line and not line.startswith('#')
+        ))
     
     return servers
 
-def process_server(server_address, key_file=None):
+def default_workers(server_count):
+    """Default number of parallel connections for the given number of servers."""
+    workers = max(16, WORKERS_PER_CPU * (os.cpu_count() or 1))
+    return max(1, min(server_count, workers, MAX_WORKERS))
+
+def process_server(server_address, key_file=None, ssh_pool=None, server_class=ServerInfo, cache=None):
     """Process one server."""
-    print(f"Checking server: {server_address}...")
-    server_info = ServerInfo(server_address, key_file=key_file)
-    success = server_info.collect_all_info()
+    logger.info(f"Checking server: {server_address}...")
+    server_info = server_class(server_address, key_file=key_file, ssh_pool=ssh_pool, cache=cache)
+    
+    if server_info.RESOLVE_BEFORE_CONNECT:
+        # Fail fast on unknown names and hosts whose SSH port does not answer;
+        # the probe's connection is then reused for SSH
+        if not server_info.probe_port(timeout=DEFAULT_TIMEOUT):
+            logger.error(f"Error while collecting information for {server_address}: {server_info.error_message}")
+            return server_info
+    
+    # Open a single SSH session and run every collection command over it
+    if server_info.connect():
+        try:
+            success = server_info.collect_all_info()
+        finally:
+            server_info.disconnect()
+    else:
+        success = False
     
     if success:
-        print(f"Information collection for {server_address} completed successfully.")
+        logger.info(f"Information collection for {server_address} completed successfully.")
     else:
-        print(f"Error while collecting information for {server_address}: {server_info.error_message}")
+        logger.error(f"Error while collecting information for {server_address}: {server_info.error_message}")
         
     return server_info
 
+def collect_all(servers, key_file=None, max_workers=None, server_class=ServerInfo, cache=None):
+    """Collect information from all servers in parallel.
+    
+    server_class is ServerInfo or a subclass with the same blocking interface.
+    cache is an optional dict kept by the caller between calls, so that
+    repeated polls reuse slow-moving outputs (see ServerInfo.CACHE_TTLS).
+    Returns ServerInfo objects in the order of the servers list.
+    """
+    # Use ThreadPoolExecutor for parallel server processing
+    results = [None] * len(servers)
+    workers = max(1, max_workers) if max_workers else default_workers(len(servers))
+    ssh_pool = SSHPool()
+    
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(process_server, server, key_file, ssh_pool, server_class, cache): index
+                for index, server in enumerate(servers)
+            }
+            
+            # Handle each server as soon as it finishes, not in submission order
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    logger.error(f"Error processing server {servers[index]}: {str(e)}")
+    finally:
+        # Close all SSH connections kept open for reuse
+        ssh_pool.close_all()
+    
+    # Keep the report in the order of the servers file
+    return [info for info in results if info is not None]
+
+async def process_server_async(server_address, key_file=None, cache=None):
+    """Process one server with the asyncssh backend."""
+    # Imported here: the module is only needed for this backend
+    from server_info_async import ServerInfoAsync
+    
+    logger.info(f"Checking server: {server_address}...")
+    server_info = ServerInfoAsync(server_address, key_file=key_file, cache=cache)
+    
+    # connect() resolves the name without blocking the event loop and tries every address;
+    # its timeout also covers hosts whose SSH port does not answer
+    if await server_info.connect():
+        try:
+            success = await server_info.collect_all_info()
+        finally:
+            await server_info.disconnect()
+    else:
+        success = False
+    
+    if success:
+        logger.info(f"Information collection for {server_address} completed successfully.")
+    else:
+        logger.error(f"Error while collecting information for {server_address}: {server_info.error_message}")
+        
+    return server_info
+
+def collect_all_async(servers, key_file=None, max_connections=None, cache=None):
+    """Collect information from all servers concurrently on one event loop (asyncssh backend).
+    
+    cache is used the same way as in collect_all().
+    Returns ServerInfo objects in the order of the servers list.
+    """
+    import asyncio
+    
+    limit = max(1, max_connections) if max_connections else max(1, min(len(servers), ASYNC_MAX_CONNECTIONS))
+    
+    async def run():
+        semaphore = asyncio.Semaphore(limit)
+        
+        async def process(server):
+            async with semaphore:
+                try:
+                    return await process_server_async(server, key_file, cache)
+                except Exception as e:
+                    logger.error(f"Error processing server {server}: {str(e)}")
+                    return None
+                    
+        return await asyncio.gather(*(process(server) for server in servers))
+    
+    loop = asyncio.new_event_loop()
+    try:
+        results = loop.run_until_complete(run())
+    finally:
+        loop.close()
+        
+    # gather() keeps the order of the servers file
+    return [info for info in results if info is not None]
+
 def main():
     """Main function."""
     parser = argparse.ArgumentParser(description='Script for checking Docker resources on servers.')
     parser.add_argument('-f', '--file', help='File with server list', default=DEFAULT_SERVERS_FILE)
     parser.add_argument('-o', '--output', help='File to write results')
     parser.add_argument('-k', '--key', help='SSH private key file')
-    parser.add_argument('--format', choices=['text', 'json', 'csv'], default=DEFAULT_OUTPUT_FORMAT,
+    parser.add_argument('--format', choices=['text', 'json', 'ndjson', 'csv'], default=DEFAULT_OUTPUT_FORMAT,
                         help='Results output format')
+    parser.add_argument('--compact', action='store_true', help='Write JSON without indentation')
+    parser.add_argument('-w', '--workers', type=int,
+                        help='Number of parallel connections (default: based on CPU count and number of servers)')
+    parser.add_argument('--backend', choices=['paramiko', 'asyncssh', 'openssh'], default='paramiko',
+                        help='SSH implementation (asyncssh needs the optional asyncssh package, '
+                             'openssh the ssh client)')
     args = parser.parse_args()
     
-    # Read server list
-    servers = read_servers_file(args.file)
-    print(f"Found {len(servers)} servers to check.")
-    
-    # Use ThreadPoolExecutor for parallel server processing
-    server_infos = []
-    
-    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(servers))) as executor:
-        futures = {
-            executor.submit(process_server, server, args.key): server
-            for server in servers
-        }
+    queue_handler, listener = setup_logging()
+    try:
+        # Read server list
+        servers = read_servers_file(args.file)
+        logger.info(f"Found {len(servers)} servers to check.")
         
-        for future in futures:
-            try:
-                server_info = future.result()
-                server_infos.append(server_info)
-            except Exception as e:
-                print(f"Error processing server {futures[future]}: {str(e)}")
+        if args.backend == 'asyncssh':
+            # Only checked here, ServerInfoAsync imports it when connecting
+            if importlib.util.find_spec('asyncssh') is None:
+                logger.error("Error: the asyncssh backend requires the asyncssh package (pip install asyncssh).")
+                sys.exit(1)
+            server_infos = collect_all_async(servers, key_file=args.key, max_connections=args.workers)
+        elif args.backend == 'openssh':
+            if shutil.which('ssh') is None:
+                logger.error("Error: the openssh backend requires the ssh client in PATH.")
+                sys.exit(1)
+            from server_info_openssh import ServerInfoOpenSSH
+            server_infos = collect_all(servers, key_file=args.key, max_workers=args.workers,
+                                       server_class=ServerInfoOpenSSH)
+        else:
+            server_infos = collect_all(servers, key_file=args.key, max_workers=args.workers)
+    finally:
+        # Write out all queued progress messages before the report is printed
+        listener.stop()
+        logger.removeHandler(queue_handler)
     
     # Format and output results
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     output_file = args.output or f"docker_resources_{timestamp}.{args.format}"
     
-    format_output(server_infos, args.format, output_file)
+    format_output(server_infos, args.format, output_file, compact=args.compact)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
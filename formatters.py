@@ -5,22 +5,313 @@
 Module for formatting server information output.
 """
 
-import json
+import io
+import os
+import sys
 import datetime
-from prettytable import PrettyTable
+import textwrap
+import contextlib
 
-def format_text_output(server_infos, output_file=None):
-    """Formatting output in text format."""
-    # Create a table for summary
-    table = PrettyTable()
-    table.field_names = ["Server", "Port", "Status", "CPU (curr.)", "Load Avg (5m)", "Cores", "Memory", "Root Disk", "Cont. (act)", "Cont. (total)"]
+import json_utils
+
+# Number of servers from which the text report is rendered in several processes
+PARALLEL_RENDER_MIN_SERVERS = 64
+
+# Columns of the summary table in the text report
+FIELD_NAMES = ("Server", "Port", "Status", "CPU (curr.)", "Load Avg (5m)", "Cores", "Memory", "Root Disk", "Cont. (act)", "Cont. (total)")
+# Values after the status column for unavailable servers
+NA_ROW_SUFFIX = ("N/A",) * (len(FIELD_NAMES) - 3)
+
+class _Tee:
+    """File-like object that writes the same data to several streams."""
+    
+    def __init__(self, *streams):
+        """Initialization with target streams."""
+        self.streams = streams
+        
+    def write(self, data):
+        """Write data to every stream."""
+        for stream in self.streams:
+            stream.write(data)
+
+@contextlib.contextmanager
+def _block_buffered_stdout():
+    """Text stream over stdout that is flushed in large blocks instead of line by line.
+    
+    Falls back to sys.stdout itself when it has no binary buffer (e.g. when replaced by a StringIO).
+    """
+    buffer = getattr(sys.stdout, 'buffer', None)
+    if buffer is None:
+        yield sys.stdout
+        return
+        
+    sys.stdout.flush()
+    stream = io.TextIOWrapper(buffer, encoding=sys.stdout.encoding, errors=sys.stdout.errors,
+                              write_through=False)
+    try:
+        yield stream
+    finally:
+        stream.flush()
+        # Detach so that the wrapper does not close the real stdout
+        stream.detach()
+
+def _justify(text, width, align):
+    """Pad text to column width according to alignment ('l', 'r' or 'c')."""
+    if align == 'l':
+        return text.ljust(width)
+    if align == 'r':
+        return text.rjust(width)
+    return text.center(width)
+
+def render_table(field_names, rows, align='c', max_width=None):
+    """Render rows as an ASCII table with the same layout as PrettyTable.
+    
+    Column widths are computed in one pass over pre-stringified cells;
+    cells longer than max_width are wrapped onto several lines.
+    """
+    widths = [len(name) for name in field_names]
+    # A column is never narrower than its header, even with max_width set
+    limits = [max(max_width, width) if max_width else None for width in widths]
+    table_rows = []
+    
+    for row in rows:
+        cells = []
+        for index, value in enumerate(row):
+            lines = str(value).split('\n')
+            cell_width = max(len(line) for line in lines)
+            
+            limit = limits[index]
+            if limit and cell_width > limit:
+                cell_width = limit
+                lines = [part.rstrip() for line in lines
+                         for part in (textwrap.wrap(line, limit) if len(line) > limit else [line])]
+                
+            if cell_width > widths[index]:
+                widths[index] = cell_width
+            cells.append(lines)
+        table_rows.append(cells)
+    
+    separator = '+' + '+'.join('-' * (width + 2) for width in widths) + '+'
+    lines = [
+        separator,
+        '| ' + ' | '.join(_justify(name, width, align) for name, width in zip(field_names, widths)) + ' |',
+        separator
+    ]
+    
+    for cells in table_rows:
+        height = max(len(cell) for cell in cells)
+        for line_index in range(height):
+            lines.append('| ' + ' | '.join(
+                _justify(cell[line_index] if line_index < len(cell) else '', width, align)
+                for cell, width in zip(cells, widths)
+            ) + ' |')
+    
+    lines.append(separator)
+    return '\n'.join(lines)
+
+def _write_section_header(out, title):
+    """Write a report section title framed by separator lines."""
+    out.write("\n" + "=" * 80 + "\n")
+    out.write(f"{title}\n")
+    out.write("=" * 80 + "\n")
+
+def render_one_server(info):
+    """Render the detailed, running containers and images sections of one server.
+    
+    Returns a tuple of three strings; sections that do not apply are empty.
+    """
+    detailed_buf = io.StringIO()
+    containers_buf = io.StringIO()
+    images_buf = io.StringIO()
+    
+    # Look up the nested sections once and reuse local references below
+    sys_info = info.info.get('system_info', {})
+    resources = info.info.get('resources', {})
+    docker = info.info.get('docker', {})
+    format_bytes = info.format_bytes
+    
+    # Get the actual hostname from system_info if available, otherwise use IP
+    system_hostname = sys_info.get('hostname', 'N/A')
+    
+    # Include hostname, IP and port in server header
+    if system_hostname and system_hostname != 'N/A':
+        server_header = f"### Server: {system_hostname} ({info.hostname}:{info.port}) ###"
+    else:
+        server_header = f"### Server: {info.hostname}:{info.port} ###"
+    
+    if not info.is_available:
+        detailed_buf.write(f"\n\n{server_header} - UNAVAILABLE\n")
+        detailed_buf.write(f"Error: {info.error_message}\n")
+        return detailed_buf.getvalue(), '', ''
+        
+    detailed_buf.write(f"\n\n{server_header}\n")
+    
+    # System information
+    detailed_buf.write("\n--- System Information ---\n")
+    detailed_buf.write(f"Hostname: {sys_info.get('hostname', 'N/A')}\n")
+    detailed_buf.write(f"OS: {sys_info.get('os', 'N/A')}\n")
+    detailed_buf.write(f"Kernel: {sys_info.get('kernel', 'N/A')}\n")
+    detailed_buf.write(f"Uptime: {sys_info.get('uptime', 'N/A')}\n")
+    
+    # Resource information
+    detailed_buf.write("\n--- Resources ---\n")
+    
+    # CPU information with load average
+    detailed_buf.write(f"CPU current load: {resources.get('cpu_usage_current', 'N/A')}%\n")
+    
+    cpu_load = resources.get('cpu_load', {})
+    if cpu_load:
+        detailed_buf.write("Load Average:\n")
+        detailed_buf.write(f"  1 min: {cpu_load.get('load_1m', 'N/A')}\n")
+        detailed_buf.write(f"  5 min: {cpu_load.get('load_5m', 'N/A')}\n")
+        detailed_buf.write(f" 15 min: {cpu_load.get('load_15m', 'N/A')}\n")
+    
+    cpu_load_relative = resources.get('cpu_load_relative', {})
+    if cpu_load_relative:
+        detailed_buf.write("Relative CPU load (% of available cores):\n")
+        detailed_buf.write(f"  1 min: {cpu_load_relative.get('load_1m_percent', 'N/A')}%\n")
+        detailed_buf.write(f"  5 min: {cpu_load_relative.get('load_5m_percent', 'N/A')}%\n")
+        detailed_buf.write(f" 15 min: {cpu_load_relative.get('load_15m_percent', 'N/A')}%\n")
+        
+    detailed_buf.write(f"Number of cores: {resources.get('cpu_cores', 'N/A')}\n")
+    
+    memory = resources.get('memory', {})
+    if memory:
+        detailed_buf.write("Memory:\n")
+        detailed_buf.write(f"  Total: {format_bytes(memory.get('total', 0))}\n")
+        detailed_buf.write(f"  Used: {format_bytes(memory.get('used', 0))} ({memory.get('usage_percent', 'N/A')}%)\n")
+        detailed_buf.write(f"  Free: {format_bytes(memory.get('free', 0))}\n")
+    
+    # All Disks Information
+    disks = resources.get('disks', {})
+    if disks:
+        detailed_buf.write("\n--- Disk Information ---\n")
+        
+        # Create table for disks
+        disk_rows = []
+        
+        # Add all disks to the table
+        for mount_point, disk_info in disks.items():
+            disk_rows.append([
+                disk_info.get('mount_point', 'N/A'),
+                disk_info.get('device', 'N/A'),
+                format_bytes(disk_info.get('total', 0)),
+                format_bytes(disk_info.get('used', 0)),
+                format_bytes(disk_info.get('free', 0)),
+                f"{disk_info.get('usage_percent', 0):.2f}%"
+            ])
+        
+        detailed_buf.write(render_table(["Mount Point", "Device", "Total", "Used", "Free", "Usage %"],
+                                        disk_rows, align='l') + "\n")
+    else:
+        # Legacy format - single disk info
+        disk = resources.get('disk', {})
+        if disk:
+            detailed_buf.write("Disk (/):\n")
+            detailed_buf.write(f"  Total: {format_bytes(disk.get('total', 0))}\n")
+            detailed_buf.write(f"  Used: {format_bytes(disk.get('used', 0))} ({disk.get('usage_percent', 'N/A')}%)\n")
+            detailed_buf.write(f"  Free: {format_bytes(disk.get('free', 0))}\n")
+    
+    # Docker information (basic)
+    if not docker.get('installed', False):
+        detailed_buf.write("\n--- Docker ---\n")
+        detailed_buf.write("Docker is not installed\n")
+        return detailed_buf.getvalue(), '', ''
+        
+    detailed_buf.write("\n--- Docker ---\n")
+    detailed_buf.write(f"Version: {docker.get('version', 'N/A')}\n")
+    
+    docker_info = docker.get('info', {})
+    detailed_buf.write(f"Running containers: {docker_info.get('containers_running', 'N/A')}\n")
+    detailed_buf.write(f"Total containers: {docker_info.get('containers_total', 'N/A')}\n")
+    detailed_buf.write(f"Images: {docker_info.get('images', 'N/A')}\n")
+    detailed_buf.write(f"Storage Driver: {docker_info.get('storage_driver', 'N/A')}\n")
+    detailed_buf.write(f"Cgroup Driver: {docker_info.get('cgroup_driver', 'N/A')}\n")
+    
+    # Running containers of this server
+    containers = docker.get('containers', {}).get('running', [])
+    if containers:
+        containers_buf.write(f"\n\n{server_header}\n")
+        
+        # Create table for containers
+        container_rows = []
+        
+        for container in containers:
+            name = container.get('Names', 'N/A')
+            image = container.get('Image', 'N/A')
+            status = container.get('Status', 'N/A')
+            
+            stats = container.get('stats', {})
+            cpu_percent = stats.get('CPUPerc', 'N/A')
+            mem_usage = stats.get('MemUsage', 'N/A')
+            
+            container_rows.append([name, image, status, cpu_percent, mem_usage])
+        
+        # Left alignment, column width limit 30
+        containers_buf.write(render_table(["Name", "Image", "Status", "CPU %", "Memory"],
+                                          container_rows, align='l', max_width=30) + "\n")
+    else:
+        containers_buf.write(f"\n\n{server_header}\n")
+        containers_buf.write("No running containers\n")
+        
+    # Docker images of this server
+    images = docker.get('images', [])
+    if images:
+        images_buf.write(f"\n\n{server_header}\n")
+        
+        # Create table for images
+        image_rows = []
+        
+        shown_images = images[:10]  # Show only first 10 images
+        for image in shown_images:
+            repo = image.get('Repository', 'N/A')
+            tag = image.get('Tag', 'N/A')
+            image_id = image.get('ID', 'N/A')
+            size = image.get('Size', 'N/A')
+            
+            image_rows.append([repo, tag, image_id, size])
+        
+        # Left alignment, column width limit 40
+        images_buf.write(render_table(["Repository", "Tag", "ID", "Size"],
+                                      image_rows, align='l', max_width=40) + "\n")
+        
+        if len(images) > 10:
+            images_buf.write(f"...and {len(images) - 10} more images...\n")
+    else:
+        images_buf.write(f"\n\n{server_header}\n")
+        images_buf.write("No Docker images\n")
+    
+    return detailed_buf.getvalue(), containers_buf.getvalue(), images_buf.getvalue()
+
+def _render_servers(server_infos):
+    """Render per-server sections, in worker processes when there are many servers."""
+    workers = os.cpu_count() or 1
+    if len(server_infos) >= PARALLEL_RENDER_MIN_SERVERS and workers > 1:
+        # Imported here: multiprocessing is only needed for large fleets
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+        
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(render_one_server, server_infos, chunksize=4))
+        except (OSError, BrokenProcessPool):
+            # Processes are unavailable in this environment, render in this one
+            pass
+            
+    return map(render_one_server, server_infos)
+
+def _write_text_report(server_infos, out, summaries=None):
+    """Write the text report section by section to a file-like object."""
+    # Rows of the summary table
+    rows = []
     
     # Get summary information about each server
-    summaries = [info.get_summary() for info in server_infos]
+    if summaries is None:
+        summaries = [info.get_summary() for info in server_infos]
     
     for summary in summaries:
         if summary['status'] == 'available':
-            table.add_row([
+            rows.append((
                 summary['hostname'],
                 summary['port'],
                 summary['status'],
@@ -31,277 +322,139 @@ def format_text_output(server_infos, output_file=None):
                 f"{summary['disk_usage']} ({summary['disk_percent']})",
                 summary['containers_running'],
                 summary['containers_total']
-            ])
+            ))
         else:
-            table.add_row([
+            rows.append((
                 summary['hostname'],
                 summary['port'],
-                f"{summary['status']}: {summary['error']}",
-                "N/A", "N/A", "N/A", "N/A", "N/A", "N/A", "N/A"
-            ])
+                f"{summary['status']}: {summary['error']}"
+            ) + NA_ROW_SUFFIX)
     
     # 1. GENERAL SUMMARY
-    output = "\n" + "=" * 80 + "\n"
-    output += "SERVER SUMMARY\n"
-    output += "=" * 80 + "\n"
-    output += str(table) + "\n"
+    _write_section_header(out, "SERVER SUMMARY")
+    out.write(render_table(FIELD_NAMES, rows) + "\n")
     
     # 2. DETAILED SERVER INFORMATION
-    output += "\n" + "=" * 80 + "\n"
-    output += "DETAILED SERVER INFORMATION\n"
-    output += "=" * 80 + "\n"
+    # Each server is rendered once into its three sections: the detailed part is
+    # written right away, the container and image parts are kept for later
+    _write_section_header(out, "DETAILED SERVER INFORMATION")
+    containers_parts = []
+    images_parts = []
     
-    for info in server_infos:
-        # Get the actual hostname from system_info if available, otherwise use IP
-        system_hostname = info.info.get('system_info', {}).get('hostname', 'N/A')
-        
-        # Include hostname, IP and port in server header
-        if system_hostname and system_hostname != 'N/A':
-            server_header = f"### Server: {system_hostname} ({info.hostname}:{info.port}) ###"
-        else:
-            server_header = f"### Server: {info.hostname}:{info.port} ###"
-        
-        if not info.is_available:
-            output += f"\n\n{server_header} - UNAVAILABLE\n"
-            output += f"Error: {info.error_message}\n"
-            continue
-            
-        output += f"\n\n{server_header}\n"
-        
-        # System information
-        sys_info = info.info.get('system_info', {})
-        output += "\n--- System Information ---\n"
-        output += f"Hostname: {sys_info.get('hostname', 'N/A')}\n"
-        output += f"OS: {sys_info.get('os', 'N/A')}\n"
-        output += f"Kernel: {sys_info.get('kernel', 'N/A')}\n"
-        output += f"Uptime: {sys_info.get('uptime', 'N/A')}\n"
-        
-        # Resource information
-        resources = info.info.get('resources', {})
-        output += "\n--- Resources ---\n"
-        
-        # CPU information with load average
-        output += f"CPU current load: {resources.get('cpu_usage_current', 'N/A')}%\n"
-        
-        cpu_load = resources.get('cpu_load', {})
-        if cpu_load:
-            output += "Load Average:\n"
-            output += f"  1 min: {cpu_load.get('load_1m', 'N/A')}\n"
-            output += f"  5 min: {cpu_load.get('load_5m', 'N/A')}\n"
-            output += f" 15 min: {cpu_load.get('load_15m', 'N/A')}\n"
-        
-        cpu_load_relative = resources.get('cpu_load_relative', {})
-        if cpu_load_relative:
-            output += "Relative CPU load (% of available cores):\n"
-            output += f"  1 min: {cpu_load_relative.get('load_1m_percent', 'N/A')}%\n"
-            output += f"  5 min: {cpu_load_relative.get('load_5m_percent', 'N/A')}%\n"
-            output += f" 15 min: {cpu_load_relative.get('load_15m_percent', 'N/A')}%\n"
-            
-        output += f"Number of cores: {resources.get('cpu_cores', 'N/A')}\n"
-        
-        memory = resources.get('memory', {})
-        if memory:
-            output += "Memory:\n"
-            output += f"  Total: {info.format_bytes(memory.get('total', 0))}\n"
-            output += f"  Used: {info.format_bytes(memory.get('used', 0))} ({memory.get('usage_percent', 'N/A')}%)\n"
-            output += f"  Free: {info.format_bytes(memory.get('free', 0))}\n"
-        
-        # All Disks Information
-        disks = resources.get('disks', {})
-        if disks:
-            output += "\n--- Disk Information ---\n"
-            
-            # Create table for disks
-            disk_table = PrettyTable()
-            disk_table.field_names = ["Mount Point", "Device", "Total", "Used", "Free", "Usage %"]
-            disk_table.align = "l"  # Left alignment
-            
-            # Add all disks to the table
-            for mount_point, disk_info in disks.items():
-                disk_table.add_row([
-                    disk_info.get('mount_point', 'N/A'),
-                    disk_info.get('device', 'N/A'),
-                    info.format_bytes(disk_info.get('total', 0)),
-                    info.format_bytes(disk_info.get('used', 0)),
-                    info.format_bytes(disk_info.get('free', 0)),
-                    f"{disk_info.get('usage_percent', 0):.2f}%"
-                ])
-            
-            output += str(disk_table) + "\n"
-        else:
-            # Legacy format - single disk info
-            disk = resources.get('disk', {})
-            if disk:
-                output += "Disk (/):\n"
-                output += f"  Total: {info.format_bytes(disk.get('total', 0))}\n"
-                output += f"  Used: {info.format_bytes(disk.get('used', 0))} ({disk.get('usage_percent', 'N/A')}%)\n"
-                output += f"  Free: {info.format_bytes(disk.get('free', 0))}\n"
-        
-        # Docker information (basic)
-        docker = info.info.get('docker', {})
-        if not docker.get('installed', False):
-            output += "\n--- Docker ---\n"
-            output += "Docker is not installed\n"
-            continue
-            
-        output += "\n--- Docker ---\n"
-        output += f"Version: {docker.get('version', 'N/A')}\n"
-        
-        docker_info = docker.get('info', {})
-        output += f"Running containers: {docker_info.get('containers_running', 'N/A')}\n"
-        output += f"Total containers: {docker_info.get('containers_total', 'N/A')}\n"
-        output += f"Images: {docker_info.get('images', 'N/A')}\n"
-        output += f"Storage Driver: {docker_info.get('storage_driver', 'N/A')}\n"
-        output += f"Cgroup Driver: {docker_info.get('cgroup_driver', 'N/A')}\n"
+    for detailed, containers, images in _render_servers(server_infos):
+        out.write(detailed)
+        containers_parts.append(containers)
+        images_parts.append(images)
     
     # 3. RUNNING CONTAINERS SECTION
-    output += "\n" + "=" * 80 + "\n"
-    output += "RUNNING CONTAINERS\n"
-    output += "=" * 80 + "\n"
+    _write_section_header(out, "RUNNING CONTAINERS")
+    out.write(''.join(containers_parts))
     
-    for info in server_infos:
-        if not info.is_available:
-            continue
-        
-        docker = info.info.get('docker', {})
-        if not docker.get('installed', False):
-            continue
-        
-        # Get the actual hostname from system_info if available, otherwise use IP
-        system_hostname = info.info.get('system_info', {}).get('hostname', 'N/A')
-        
-        # Include hostname, IP and port in server header
-        if system_hostname and system_hostname != 'N/A':
-            server_header = f"### Server: {system_hostname} ({info.hostname}:{info.port}) ###"
-        else:
-            server_header = f"### Server: {info.hostname}:{info.port} ###"
-            
-        containers = docker.get('containers', {}).get('running', [])
-        if containers:
-            output += f"\n\n{server_header}\n"
-            
-            # Create table for containers
-            container_table = PrettyTable()
-            container_table.field_names = ["Name", "Image", "Status", "CPU %", "Memory"]
-            container_table.align = "l"  # Left alignment
-            container_table.max_width = 30  # Column width limit
-            
-            for container in containers:
-                name = container.get('Names', 'N/A')
-                image = container.get('Image', 'N/A')
-                status = container.get('Status', 'N/A')
-                
-                stats = container.get('stats', {})
-                cpu_percent = stats.get('CPUPerc', 'N/A')
-                mem_usage = stats.get('MemUsage', 'N/A')
-                
-                container_table.add_row([name, image, status, cpu_percent, mem_usage])
-            
-            output += str(container_table) + "\n"
+    # 4. DOCKER IMAGES SECTION
+    _write_section_header(out, "DOCKER IMAGES")
+    out.write(''.join(images_parts))
+
+def format_text_output(server_infos, output_file=None, summaries=None):
+    """Formatting output in text format."""
+    # Write the report directly to stdout (and the file, if specified) as it is produced
+    with _block_buffered_stdout() as stdout:
+        if output_file:
+            with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                _write_text_report(server_infos, _Tee(stdout, f), summaries)
         else:
-            output += f"\n\n{server_header}\n"
-            output += "No running containers\n"
+            _write_text_report(server_infos, stdout, summaries)
+        stdout.write("\n")
+        
+    if output_file:
+        print(f"\nResults saved to file: {output_file}")
 
-    # 4. DOCKER IMAGES SECTION
-    output += "\n" + "=" * 80 + "\n"
-    output += "DOCKER IMAGES\n"
-    output += "=" * 80 + "\n"
+def _write_json_document(write, server_infos, indent=True):
+    """Write the JSON report incrementally, encoding one server at a time.
     
-    for info in server_infos:
-        if not info.is_available:
-            continue
-        
-        docker = info.info.get('docker', {})
-        if not docker.get('installed', False):
-            continue
+    The result is the same document as encoding the whole structure at once
+    (with indentation, or compact if indent is False), without holding the
+    complete encoded report in memory.
+    """
+    timestamp = json_utils.dumps(datetime.datetime.now().isoformat())
+    if not indent:
+        write(b'{"timestamp":' + timestamp + b',"servers":[')
+        separator = b''
+        for info in server_infos:
+            write(separator + json_utils.dumps(info.info, indent=False))
+            separator = b','
+        write(b']}')
+        return
         
-        # Get the actual hostname from system_info if available, otherwise use IP
-        system_hostname = info.info.get('system_info', {}).get('hostname', 'N/A')
-        
-        # Include hostname, IP and port in server header
-        if system_hostname and system_hostname != 'N/A':
-            server_header = f"### Server: {system_hostname} ({info.hostname}:{info.port}) ###"
-        else:
-            server_header = f"### Server: {info.hostname}:{info.port} ###"
-            
-        images = docker.get('images', [])
-        if images:
-            output += f"\n\n{server_header}\n"
-            
-            # Create table for images
-            image_table = PrettyTable()
-            image_table.field_names = ["Repository", "Tag", "ID", "Size"]
-            image_table.align = "l"  # Left alignment
-            image_table.max_width = 40  # Column width limit
-            
-            shown_images = images[:10]  # Show only first 10 images
-            for image in shown_images:
-                repo = image.get('Repository', 'N/A')
-                tag = image.get('Tag', 'N/A')
-                image_id = image.get('ID', 'N/A')
-                size = image.get('Size', 'N/A')
-                
-                image_table.add_row([repo, tag, image_id, size])
-            
-            output += str(image_table) + "\n"
-            
-            if len(images) > 10:
-                output += f"...and {len(images) - 10} more images...\n"
-        else:
-            output += f"\n\n{server_header}\n"
-            output += "No Docker images\n"
-    
-    # Print and save results
-    print(output)
+    write(b'{\n  "timestamp": ' + timestamp + b',\n  "servers": [')
     
-    # Write to file, if specified
+    count = 0
+    for info in server_infos:
+        write(b',\n    ' if count else b'\n    ')
+        # Encoded JSON has no raw newlines inside strings, so re-indenting by line is safe
+        write(json_utils.dumps(info.info).replace(b'\n', b'\n    '))
+        count += 1
+        
+    write(b'\n  ]\n}' if count else b']\n}')
+
+def format_json_output(server_infos, output_file=None, compact=False):
+    """Formatting output in JSON format (without indentation if compact)."""
     if output_file:
-        with open(output_file, 'w') as f:
-            f.write(output)
-            
+        with open(output_file, 'wb', buffering=1 << 20) as f:
+            _write_json_document(f.write, server_infos, indent=not compact)
         print(f"\nResults saved to file: {output_file}")
+    else:
+        _write_json_document(lambda data: sys.stdout.write(data.decode('utf-8')), server_infos,
+                             indent=not compact)
+        sys.stdout.write("\n")
 
-def format_json_output(server_infos, output_file=None):
-    """Formatting output in JSON format."""
-    result = json.dumps({
-        'timestamp': datetime.datetime.now().isoformat(),
-        'servers': [info.info for info in server_infos]
-    }, indent=2)
-    
+def format_ndjson_output(server_infos, output_file=None):
+    """Formatting output in NDJSON format (one JSON document per server per line)."""
     if output_file:
-        with open(output_file, 'w') as f:
-            f.write(result)
+        with open(output_file, 'wb', buffering=1 << 20) as f:
+            for info in server_infos:
+                f.write(json_utils.dumps(info.info, indent=False) + b'\n')
         print(f"\nResults saved to file: {output_file}")
     else:
-        print(result)
+        for info in server_infos:
+            print(json_utils.dumps(info.info, indent=False).decode('utf-8'))
 
-def format_csv_output(server_infos, output_file=None):
+def _write_csv_rows(out, headers, summaries):
+    """Write header and summary rows with csv quoting (values may contain commas)."""
+    import csv  # Only needed for CSV output
+    
+    # Summaries have more keys than the report columns, those are left out
+    writer = csv.DictWriter(out, fieldnames=headers, restval='', extrasaction='ignore', lineterminator='\n')
+    writer.writeheader()
+    writer.writerows(summaries)
+
+def format_csv_output(server_infos, output_file=None, summaries=None):
     """Formatting output in CSV format."""
     headers = ['hostname', 'port', 'status', 'cpu_usage', 'cpu_load_1m', 'cpu_load_5m', 'cpu_load_15m', 
               'cpu_load_relative', 'cpu_cores', 'memory_usage', 'memory_percent', 
               'disk_usage', 'disk_percent', 'containers_running', 'containers_total']
     
     # Get summary information about each server
-    summaries = [info.get_summary() for info in server_infos]
-    
-    csv_content = ','.join(headers) + '\n'
-    
-    for summary in summaries:
-        row = [str(summary.get(header, '')) for header in headers]
-        csv_content += ','.join(row) + '\n'
+    if summaries is None:
+        summaries = [info.get_summary() for info in server_infos]
     
     if output_file:
-        with open(output_file, 'w') as f:
-            f.write(csv_content)
+        with open(output_file, 'w', encoding='utf-8', newline='', buffering=1 << 20) as f:
+            _write_csv_rows(f, headers, summaries)
         print(f"\nResults saved to file: {output_file}")
     else:
-        print(csv_content)
+        _write_csv_rows(sys.stdout, headers, summaries)
 
-def format_output(server_infos, output_format, output_file=None):
+def format_output(server_infos, output_format, output_file=None, compact=False):
     """Formatting and output of results in chosen format."""
     if output_format == 'json':
-        format_json_output(server_infos, output_file)
-    elif output_format == 'csv':
-        format_csv_output(server_infos, output_file)
-    else:  # 'text' by default
-        format_text_output(server_infos, output_file)
\ No newline at end of file
+        format_json_output(server_infos, output_file, compact)
+    elif output_format == 'ndjson':
+        format_ndjson_output(server_infos, output_file)
+    else:
+        # Text and CSV share the same per-server summaries, build them once
+        summaries = [info.get_summary() for info in server_infos]
+        
+        if output_format == 'csv':
+            format_csv_output(server_infos, output_file, summaries)
+        else:  # 'text' by default
+            format_text_output(server_infos, output_file, summaries)
\ No newline at end of file
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Module with JSON encoding and decoding helpers (orjson is used if it is installed).
+"""
+
+import json
+
+try:
+    import orjson  # Optional: much faster JSON encoder and decoder
+except ImportError:
+    orjson = None
+
+# Parse JSON from str or bytes; orjson raises a subclass of json.JSONDecodeError on invalid input
+if orjson is not None:
+    loads = orjson.loads
+else:
+    loads = json.loads
+
+def dumps(obj, indent=True):
+    """Serialize object to UTF-8 encoded JSON, indented by 2 spaces or compact."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
\ No newline at end of file
@@ -6,47 +6,139 @@ Module for collecting information about servers via SSH.
 """
 
 import os
+import re
 import json
 import socket
-import paramiko
+import time
+import select
+import logging
+import functools
+
+import json_utils
+
+# Child of the logger of the command line tool, so messages go through its handlers
+logger = logging.getLogger('docker_resources.server_info')
+
+# Units for format_bytes() and the number of bytes in each of them
+BYTE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+BYTE_DIVISORS = tuple(1 << (10 * i) for i in range(len(BYTE_UNITS)))
+
+# Patterns for the output of /proc/loadavg, /proc/meminfo ("Name: value kB" lines) and df -B1 (one line per filesystem)
+_LOADAVG_RE = re.compile(r'^(\S+)\s+(\S+)\s+(\S+)')
+_MEMINFO_RE = re.compile(r'^(\w+):\s+(\d+) kB$', re.MULTILINE)
+_DF_RE = re.compile(r'^(\S+)\s+(\d+)\s+(\d+)\s+(\d+)\s+\S+\s+(\S+)', re.MULTILINE)
+
+# Connection string: optional "user@", host name or [IPv6 address], optional ":port"
+_CONN_RE = re.compile(r'^(?:([^@]+)@)?(\[[^\]]+\]|[^:]+)(?::(\d+))?$')
+
+CONNECT_TIMEOUT = 5  # Seconds to wait for the TCP connection and SSH handshake of a server
+COMMAND_TIMEOUT = 30  # Seconds without output from a remote command before it is abandoned
+KEEPALIVE_INTERVAL = 30  # Seconds between SSH keepalives on open connections
+READ_CHUNK_SIZE = 65536  # Bytes taken from a channel stream per read
+
+@functools.lru_cache(maxsize=None)
+def _parse_target(spec, default_port=22, default_user=None):
+    """Split a [user@]hostname[:port] string into (hostname, port, username).
+    
+    IPv6 addresses are written in brackets: [::1]:22. Results are cached, as
+    the same servers are parsed again on every poll.
+    """
+    match = _CONN_RE.match(spec)
+    if not match:
+        # Not a connection string (e.g. an IPv6 address without brackets), use it as is
+        return spec, default_port, default_user
+    
+    return match[2].strip('[]'), int(match[3]) if match[3] else default_port, match[1] or default_user
+
+@functools.lru_cache(maxsize=None)
+def _load_private_key(path):
+    """Parse a private key file once for all connections (None if it cannot be read without a passphrase)."""
+    import paramiko
+    
+    for key_class in (paramiko.Ed25519Key, paramiko.ECDSAKey, paramiko.RSAKey):
+        try:
+            return key_class.from_private_key_file(path)
+        except paramiko.SSHException:  # Another key type or an encrypted key
+            continue
+    return None
 
 class ServerInfo:
     """Class for collecting and storing server information."""
     
-    def __init__(self, hostname, username=None, port=22, key_file=None, password=None):
-        """Initialization with connection parameters."""
-        # Process user@hostname:port format
-        if '@' in hostname:
-            parts = hostname.split('@')
-            username_part = parts[0]
-            host_part = parts[1]
-            
-            # Check for port
-            if ':' in host_part:
-                host_parts = host_part.split(':')
-                self.hostname = host_parts[0]
-                self.port = int(host_parts[1])
-            else:
-                self.hostname = host_part
-                self.port = port
-                
-            self.username = username_part
+    # Commands of each collection step as (section name, shell command) pairs;
+    # a group is sent to the server as one script by execute_batch()
+    SYSTEM_COMMANDS = (
+        ('hostname', "hostname"),
+        ('os', "awk '/^PRETTY_NAME=/ {sub(/^PRETTY_NAME=/, \"\"); gsub(/\"/, \"\"); print}' /etc/os-release"),
+        ('kernel', "uname -r"),
+        ('uptime', "uptime -p"),
+    )
+    RESOURCE_COMMANDS = (
+        ('loadavg', "cat /proc/loadavg"),
+        # Two samples of the aggregate CPU times, the usage is computed from their difference
+        ('cpu', "grep '^cpu ' /proc/stat; sleep 0.2; grep '^cpu ' /proc/stat"),
+        ('nproc', "nproc"),
+        ('memory', "cat /proc/meminfo"),
+        ('disks', "df -B1 | awk '!/tmpfs|udev|loop/'"),
+    )
+    DOCKER_COMMANDS = (
+        # Also tells whether Docker is installed: the section is empty if the command is missing
+        ('docker_version', "docker --version"),
+        ('docker_info', "docker info --format '{{json .}}'"),
+        ('containers_running', "docker ps --format '{{json .}}'"),
+        ('containers_all', "docker ps -a --format '{{json .}}'"),
+        ('images', "docker images --format '{{json .}}'"),
+        # Stats and limits of all running containers at once instead of per container
+        ('container_stats', "docker stats --no-stream --format '{{json .}}'"),
+        # "|| true" keeps the output for the others if a container stops in the meantime
+        ('container_limits', "docker inspect --format '{{.Name}} {{.HostConfig.CpuShares}} {{.HostConfig.Memory}}' "
+                             "$(docker ps -q) || true"),
+    )
+    
+    ALL_COMMANDS = SYSTEM_COMMANDS + RESOURCE_COMMANDS + DOCKER_COMMANDS
+    
+    SECTION_MARKER = "__DOCKER_RESOURCES_SECTION__"
+    
+    # Whether process_server() resolves the host name and probes the SSH port before connect()
+    RESOLVE_BEFORE_CONNECT = True
+    
+    # Seconds for which the output of slow-moving sections is reused instead of
+    # being collected again; all other sections are collected on every call
+    CACHE_TTLS = {
+        'hostname': 3600,
+        'os': 3600,
+        'kernel': 3600,
+        'docker_version': 300,
+    }
+    
+    # One instance is kept per server; fixed slots keep them small and attribute access fast
+    __slots__ = ('hostname', 'port', 'username', 'key_file', 'password', 'ssh_pool',
+                 'client', '_transport', '_sock', 'is_available', 'error_message', '_summary', '_cache', 'info')
+    
+    def __init__(self, hostname, username=None, port=22, key_file=None, password=None, ssh_pool=None,
+                 cache=None):
+        """Initialization with connection parameters.
+        
+        hostname is a [user@]hostname[:port] string or an already parsed
+        (hostname, port, username) tuple. cache is a dict for outputs of the
+        sections in CACHE_TTLS; it may be shared between instances since its
+        keys include the host and port.
+        """
+        if isinstance(hostname, str):
+            self.hostname, self.port, self.username = _parse_target(hostname, port, username)
         else:
-            # Check for port without username
-            if ':' in hostname:
-                host_parts = hostname.split(':')
-                self.hostname = host_parts[0]
-                self.port = int(host_parts[1])
-            else:
-                self.hostname = hostname
-                self.port = port
-                
-            self.username = username
+            self.hostname, self.port, self.username = hostname
             
         self.key_file = key_file
         self.password = password
+        self.ssh_pool = ssh_pool
+        self.client = None
+        self._transport = None
+        self._sock = None  # Socket connected by probe_port, used by the next new connection
         self.is_available = False
         self.error_message = None
+        self._summary = None
+        self._cache = {} if cache is None else cache
         self.info = {
             'hostname': self.hostname,
             'port': self.port,
@@ -63,30 +155,100 @@ class ServerInfo:
                 'images': []
             }
         }
+    
+    def __getstate__(self):
+        """State for pickling (e.g. to render in worker processes) without connection objects."""
+        state = {name: getattr(self, name) for name in ServerInfo.__slots__}
+        state['ssh_pool'] = None
+        state['client'] = None
+        state['_transport'] = None
+        state['_sock'] = None
+        return state
+    
+    def __setstate__(self, state):
+        """Restore attributes from pickled state."""
+        for name, value in state.items():
+            setattr(self, name, value)
+    
+    @property
+    def pool_key(self):
+        """Key identifying this server's connection in the SSH pool."""
+        return (self.username, self.hostname, self.port, self.key_file)
         
-    def connect(self):
-        """Establish SSH connection to the server."""
-        try:
-            self.client = paramiko.SSHClient()
-            self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            
-            connect_args = {
-                'hostname': self.hostname,
-                'port': self.port,
-                'timeout': 5  # DEFAULT_TIMEOUT
-            }
+    def _open_client(self):
+        """Create a new SSH client connected to the server."""
+        import paramiko  # Loading paramiko takes most of the startup time, so only when connecting
+        
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        
+        connect_args = {
+            'hostname': self.hostname,
+            'port': self.port,
+            'timeout': CONNECT_TIMEOUT,
+            'compress': True  # The JSON lists of docker ps -a and docker images compress well
+        }
+        
+        if self.username:
+            connect_args['username'] = self.username
             
-            if self.username:
-                connect_args['username'] = self.username
-                
-            if self.key_file:
-                if os.path.exists(os.path.expanduser(self.key_file)):
-                    connect_args['key_filename'] = os.path.expanduser(self.key_file)
+        if self.key_file:
+            key_path = os.path.expanduser(self.key_file)
+            if os.path.exists(key_path):
+                pkey = _load_private_key(key_path)
+                if pkey is not None:
+                    connect_args['pkey'] = pkey
+                else:
+                    # Let paramiko handle keys that could not be parsed up front
+                    connect_args['key_filename'] = key_path
+        
+        if self.password:
+            connect_args['password'] = self.password
+        
+        if self._sock is not None:
+            # Run SSH over the connection made by probe_port instead of connecting again
+            connect_args['sock'], self._sock = self._sock, None
             
-            if self.password:
-                connect_args['password'] = self.password
-                
-            self.client.connect(**connect_args)
+        try:
+            client.connect(**connect_args)
+            # Keepalives stop NAT and firewalls from silently dropping pooled connections
+            client.get_transport().set_keepalive(KEEPALIVE_INTERVAL)
+        except Exception:
+            client.close()
+            raise
+        return client
+    
+    def probe_port(self, timeout=CONNECT_TIMEOUT):
+        """Check that the SSH port accepts TCP connections before starting SSH.
+        
+        Every address of the host is tried in turn. The connected socket is
+        kept, and connect() runs SSH over it rather than connecting again.
+        """
+        try:
+            self._sock = socket.create_connection((self.hostname, self.port), timeout=timeout)
+            return True
+        except (socket.gaierror, UnicodeError) as e:
+            self.error_message = f"Name resolution error: {str(e)}"
+            return False
+        except socket.timeout:
+            self.error_message = "Connection timeout"
+            return False
+        except OSError as e:
+            self.error_message = f"Connection error: {str(e)}"
+            return False
+    
+    def connect(self):
+        """Establish SSH connection to the server (reusing a pooled one if possible)."""
+        import paramiko
+        
+        self._summary = None
+        try:
+            if self.ssh_pool is not None:
+                self.client = self.ssh_pool.acquire(self.pool_key, self._open_client)
+            else:
+                self.client = self._open_client()
+            # Commands open their channels directly on the transport of the connection
+            self._transport = self.client.get_transport()
             self.is_available = True
             return True
         except socket.timeout:
@@ -101,89 +263,238 @@ class ServerInfo:
         except Exception as e:
             self.error_message = f"Connection error: {str(e)}"
             return False
+        finally:
+            # The probe socket is left over when the pool had a connection to reuse
+            if self._sock is not None:
+                self._sock.close()
+                self._sock = None
+    
+    def _is_connected(self):
+        """Check whether connect() has been called without a disconnect() since."""
+        return self.client is not None
     
     def disconnect(self):
-        """Close SSH connection."""
-        if hasattr(self, 'client'):
-            self.client.close()
+        """Close SSH connection or return it to the pool."""
+        if self.client is not None:
+            if self.ssh_pool is not None:
+                self.ssh_pool.release(self.pool_key, self.client)
+            else:
+                self.client.close()
+            self.client = None
+            self._transport = None
     
-    def execute_command(self, command):
-        """Execute command on server and return result."""
+    def execute_command(self, command, expect_exit=True):
+        """Execute command on server and return result.
+        
+        With expect_exit=False the exit code is not waited for: the output is
+        returned as soon as it has been read, even if the command failed.
+        """
         if not self.is_available:
             return None, f"Server unavailable: {self.error_message}"
             
         try:
-            stdin, stdout, stderr = self.client.exec_command(command, timeout=5)
-            exit_status = stdout.channel.recv_exit_status()  # Wait for command completion
+            # A bare session channel: no stdin file and no pty, closed right after the command
+            channel = self._transport.open_session(timeout=5)
+            try:
+                channel.settimeout(COMMAND_TIMEOUT)
+                channel.exec_command(command)
+                
+                # Read the output before waiting for the exit code so a large one cannot stall the channel
+                output, error = self._drain_channel(channel)
+                exit_status = channel.recv_exit_status() if expect_exit else 0  # Wait for command completion
+            finally:
+                channel.close()
             
-            output = stdout.read().decode('utf-8', errors='replace').strip()
-            error = stderr.read().decode('utf-8', errors='replace').strip()
+            return self._command_result(output, error, exit_status)
+        except Exception as e:
+            return None, f"Error executing command '{command}': {str(e)}"
+    
+    @staticmethod
+    def _command_result(output, error, exit_status):
+        """Turn the output, stderr and exit code of a command into the (output, error) result of execute_command()."""
+        if exit_status != 0:
+            if error:
+                return None, f"Command completed with error (code {exit_status}): {error}"
+            else:
+                return None, f"Command completed with error (code {exit_status})"
+        
+        if error and not output:
+            return None, error
+        
+        return output, error
+    
+    @staticmethod
+    def _drain_channel(channel):
+        """Read stdout and stderr of a channel until EOF and return them as stripped text.
+        
+        Both streams share the channel window, so whichever has data is read
+        first; reading stdout to the end before stderr would stall a command
+        that writes a lot to stderr.
+        """
+        output_chunks = []
+        error_chunks = []
+        while True:
+            # The channel becomes readable when either stream has data or at EOF
+            if not select.select([channel], [], [], COMMAND_TIMEOUT)[0]:
+                raise socket.timeout("timed out")
             
-            if exit_status != 0:
-                if error:
-                    return None, f"Command completed with error (code {exit_status}): {error}"
-                else:
-                    return None, f"Command completed with error (code {exit_status})"
+            if channel.recv_stderr_ready():
+                error_chunks.append(channel.recv_stderr(READ_CHUNK_SIZE))
+                continue
             
-            if error and not output:
-                return None, error
+            chunk = channel.recv(READ_CHUNK_SIZE)  # Empty only at EOF
+            if not chunk:
+                break
+            output_chunks.append(chunk)
             
-            return output, error
-        except Exception as e:
-            return None, f"Error executing command '{command}': {str(e)}"
+        output = b''.join(output_chunks).decode('utf-8', errors='replace').strip()
+        error = b''.join(error_chunks).decode('utf-8', errors='replace').strip()
+        return output, error
+    
+    def execute_batch(self, commands):
+        """Execute several commands in a single SSH exec.
+        
+        commands is a sequence of (section name, shell command) pairs. Returns a
+        dict mapping each section name to its output, or to None if the command
+        failed or printed nothing (the same way execute_command() reports it).
+        """
+        # Exit codes are reported per command by the markers, not by the script
+        output, _ = self.execute_command(self._batch_script(commands), expect_exit=False)
+        return self._split_sections(output) if output else {}
+    
+    def _batch_script(self, commands):
+        """Build one shell script that runs all commands and marks where each output ends."""
+        script_parts = []
+        for name, command in commands:
+            # Each command is followed by a marker line with its section name and exit code
+            script_parts.append(f"{{ {command}\n}} 2>/dev/null\n"
+                                f"printf '\\n%s %s %s\\n' {self.SECTION_MARKER} {name} \"$?\"")
+        return '\n'.join(script_parts)
+    
+    def _cached_sections(self, commands):
+        """Split commands into cached outputs that are still valid and commands to run.
+        
+        Returns the cached sections, the commands to run and the current time
+        to pass to _store_cached() with their output.
+        """
+        now = time.monotonic()
+        sections = {}
+        pending = []
+        for name, command in commands:
+            entry = self._cache.get(f"{self.hostname}:{self.port}:{name}")
+            if entry is not None and entry[1] > now:
+                sections[name] = entry[0]
+            else:
+                pending.append((name, command))
+        
+        return sections, pending, now
+    
+    def _store_cached(self, sections, fresh, now):
+        """Remember freshly collected outputs of the sections in CACHE_TTLS and add them to sections.
+        
+        Failed sections (None) are not stored, so they are collected again next time.
+        """
+        for name, output in fresh.items():
+            ttl = self.CACHE_TTLS.get(name)
+            if ttl and output is not None:
+                self._cache[f"{self.hostname}:{self.port}:{name}"] = (output, now + ttl)
+        sections.update(fresh)
+        return sections
+    
+    def execute_batch_cached(self, commands):
+        """Same as execute_batch(), but sections in CACHE_TTLS are reused until they expire."""
+        sections, pending, now = self._cached_sections(commands)
+        if pending:
+            self._store_cached(sections, self.execute_batch(pending), now)
+        return sections
+    
+    def _split_sections(self, output):
+        """Split batched command output into sections by marker lines."""
+        sections = {}
+        lines = []
+        for line in output.split('\n'):
+            if line.startswith(self.SECTION_MARKER):
+                _, name, exit_status = line.split()
+                text = '\n'.join(lines).strip()
+                sections[name] = text if exit_status == '0' and text else None
+                lines = []
+            else:
+                lines.append(line)
+                
+        return sections
     
     def collect_system_info(self):
         """Collect general system information."""
         if not self.is_available:
             return
             
-        # Get hostname
-        output, _ = self.execute_command("hostname")
+        self._parse_system_info(self.execute_batch_cached(self.SYSTEM_COMMANDS))
+    
+    def collect_resource_info(self):
+        """Collect resource information."""
+        if not self.is_available:
+            return
+            
+        self._parse_resource_info(self.execute_batch(self.RESOURCE_COMMANDS))
+    
+    def collect_docker_info(self):
+        """Collect information about Docker and containers."""
+        if not self.is_available:
+            return
+            
+        self._parse_docker_info(self.execute_batch_cached(self.DOCKER_COMMANDS))
+    
+    def _parse_combined(self, sections):
+        """Fill in all information from the output of one batch with every command."""
+        self._parse_system_info(sections)
+        self._parse_resource_info(sections)
+        self._parse_docker_info(sections)
+    
+    def _parse_system_info(self, sections):
+        """Fill in general system information from batched command output."""
+        # Hostname
+        output = sections.get('hostname')
         if output:
             self.info['system_info']['hostname'] = output
             
-        # Get OS information
-        output, _ = self.execute_command("cat /etc/os-release | grep PRETTY_NAME | cut -d '\"' -f 2")
+        # OS information
+        output = sections.get('os')
         if output:
             self.info['system_info']['os'] = output
             
-        # Get kernel version
-        output, _ = self.execute_command("uname -r")
+        # Kernel version
+        output = sections.get('kernel')
         if output:
             self.info['system_info']['kernel'] = output
             
-        # Get system uptime
-        output, _ = self.execute_command("uptime -p")
+        # System uptime
+        output = sections.get('uptime')
         if output:
             self.info['system_info']['uptime'] = output
     
-    def collect_resource_info(self):
-        """Collect resource information."""
-        if not self.is_available:
-            return
-            
+    def _parse_resource_info(self, sections):
+        """Fill in resource information from batched command output."""
         # More accurate CPU information - average load for 1, 5, and 15 minutes
-        output, _ = self.execute_command("cat /proc/loadavg")
-        if output:
-            parts = output.split()
-            if len(parts) >= 3:
-                self.info['resources']['cpu_load'] = {
-                    'load_1m': float(parts[0]),
-                    'load_5m': float(parts[1]),
-                    'load_15m': float(parts[2])
-                }
+        output = sections.get('loadavg')
+        match = _LOADAVG_RE.match(output) if output else None
+        if match:
+            self.info['resources']['cpu_load'] = {
+                'load_1m': float(match[1]),
+                'load_5m': float(match[2]),
+                'load_15m': float(match[3])
+            }
             
-        # Current CPU usage (instant snapshot)
-        output, _ = self.execute_command("top -bn1 | grep 'Cpu(s)'")
+        # Current CPU usage (over a short interval)
+        output = sections.get('cpu')
         if output:
-            # Parse top output for CPU usage
-            parts = output.split(',')
-            user_cpu = float(parts[0].split()[1])
-            system_cpu = float(parts[1].split()[0])
-            self.info['resources']['cpu_usage_current'] = round(user_cpu + system_cpu, 2)
+            samples = [self._cpu_times(line) for line in output.split('\n')]
+            if len(samples) == 2:
+                (busy_1, total_1), (busy_2, total_2) = samples
+                if total_2 > total_1:
+                    self.info['resources']['cpu_usage_current'] = round((busy_2 - busy_1) / (total_2 - total_1) * 100, 2)
             
         # Number of CPU cores
-        output, _ = self.execute_command("nproc")
+        output = sections.get('nproc')
         if output:
             self.info['resources']['cpu_cores'] = int(output)
             
@@ -197,57 +508,61 @@ class ServerInfo:
                 }
             
         # Memory information
-        output, _ = self.execute_command("free -b")
-        if output:
-            lines = output.strip().split('\n')
-            if len(lines) > 1:
-                mem_parts = lines[1].split()
-                if len(mem_parts) >= 7:
-                    total_mem = int(mem_parts[1])
-                    used_mem = int(mem_parts[2])
-                    self.info['resources']['memory'] = {
-                        'total': total_mem,
-                        'used': used_mem,
-                        'free': total_mem - used_mem,
-                        'usage_percent': round((used_mem / total_mem) * 100, 2)
-                    }
+        output = sections.get('memory')
+        meminfo = {name: int(value) * 1024 for name, value in _MEMINFO_RE.findall(output)} if output else {}
+        total_mem = meminfo.get('MemTotal')
+        if total_mem:
+            free_mem = meminfo.get('MemFree', 0)
+            buffers = meminfo.get('Buffers', 0)
+            cached = meminfo.get('Cached', 0) + meminfo.get('SReclaimable', 0)  # The "cache" column of free
+            # Used memory as free(1) of procps 3.3.x counts it, which most hosts ship;
+            # procps 4 reports total - MemAvailable instead
+            used_mem = total_mem - free_mem - buffers - cached
+            if used_mem < 0:
+                used_mem = total_mem - free_mem
+            # Kernels before 3.14 have no MemAvailable
+            available = meminfo.get('MemAvailable', free_mem + buffers + cached)
+            self.info['resources']['memory'] = {
+                'total': total_mem,
+                'used': used_mem,
+                'free': total_mem - used_mem,
+                'usage_percent': round((used_mem / total_mem) * 100, 2),
+                'available': available,
+                'buffers': buffers,
+                'cached': cached,
+                'swap_total': meminfo.get('SwapTotal', 0),
+                'swap_free': meminfo.get('SwapFree', 0)
+            }
         
-        # Get information about all mounted disks
-        output, _ = self.execute_command("df -B1 | grep -v tmpfs | grep -v udev | grep -v loop")
+        # Information about all mounted disks
+        output = sections.get('disks')
         if output:
             self.info['resources']['disks'] = {}
-            lines = output.strip().split('\n')
             
-            # Skip header line if present
-            if 'Filesystem' in lines[0]:
-                lines = lines[1:]
+            # The header line does not match the pattern
+            for match in _DF_RE.finditer(output):
+                device, total_disk, used_disk, avail_disk, mount_point = match.groups()
+                total_disk = int(total_disk)
+                used_disk = int(used_disk)
+                avail_disk = int(avail_disk)
                 
-            for line in lines:
-                parts = line.split()
-                if len(parts) >= 6:
-                    device = parts[0]
-                    mount_point = parts[5]
-                    total_disk = int(parts[1])
-                    used_disk = int(parts[2])
-                    avail_disk = int(parts[3])
+                # Skip very small or virtual filesystems
+                if total_disk < 10*1024*1024:  # Skip partitions smaller than 10MB
+                    continue
+                    
+                # Use mount point as key (clean it for dictionary key)
+                key = mount_point.replace('/', '_').strip('_')
+                if not key:
+                    key = 'root'
                     
-                    # Skip very small or virtual filesystems
-                    if total_disk < 10*1024*1024:  # Skip partitions smaller than 10MB
-                        continue
-                        
-                    # Use mount point as key (clean it for dictionary key)
-                    key = mount_point.replace('/', '_').strip('_')
-                    if not key:
-                        key = 'root'
-                        
-                    self.info['resources']['disks'][key] = {
-                        'device': device,
-                        'mount_point': mount_point,
-                        'total': total_disk,
-                        'used': used_disk,
-                        'free': avail_disk,
-                        'usage_percent': round((used_disk / total_disk) * 100, 2) if total_disk > 0 else 0
-                    }
+                self.info['resources']['disks'][key] = {
+                    'device': device,
+                    'mount_point': mount_point,
+                    'total': total_disk,
+                    'used': used_disk,
+                    'free': avail_disk,
+                    'usage_percent': round((used_disk / total_disk) * 100, 2) if total_disk > 0 else 0
+                }
             
             # Also store root disk info in the old location for backwards compatibility
             if 'root' in self.info['resources']['disks']:
@@ -258,29 +573,33 @@ class ServerInfo:
                     first_key = next(iter(self.info['resources']['disks']))
                     self.info['resources']['disk'] = self.info['resources']['disks'][first_key]
     
-    def collect_docker_info(self):
-        """Collect information about Docker and containers."""
-        if not self.is_available:
-            return
-            
+    @staticmethod
+    def _cpu_times(line):
+        """Return busy and total CPU time from the "cpu" line of /proc/stat."""
+        # user nice system idle iowait irq softirq steal (guest time is already in user)
+        times = [int(value) for value in line.split()[1:9]]
+        idle = times[3] + times[4]
+        total = sum(times)
+        return total - idle, total
+    
+    def _parse_docker_info(self, sections):
+        """Fill in Docker, container and image information from batched command output."""
         # Check if Docker is installed
-        output, _ = self.execute_command("command -v docker")
+        output = sections.get('docker_version')
         if not output:
             self.info['docker']['installed'] = False
             return
             
         self.info['docker']['installed'] = True
         
-        # Get Docker version
-        output, _ = self.execute_command("docker --version")
-        if output:
-            self.info['docker']['version'] = output
+        # Docker version
+        self.info['docker']['version'] = output
             
-        # Get Docker daemon information
-        output, _ = self.execute_command("docker info --format '{{json .}}'")
+        # Docker daemon information
+        output = sections.get('docker_info')
         if output:
             try:
-                docker_info = json.loads(output)
+                docker_info = json_utils.loads(output)
                 self.info['docker']['info'] = {
                     'containers_running': docker_info.get('ContainersRunning', 0),
                     'containers_total': docker_info.get('Containers', 0),
@@ -289,7 +608,7 @@ class ServerInfo:
                     'cgroup_driver': docker_info.get('CgroupDriver', '')
                 }
             except json.JSONDecodeError as e:
-                print(f"Error while parsing Docker JSON information on {self.hostname}: {str(e)}")
+                logger.error(f"Error while parsing Docker JSON information on {self.hostname}: {str(e)}")
                 # Set default values
                 self.info['docker']['info'] = {
                     'containers_running': 0,
@@ -299,122 +618,80 @@ class ServerInfo:
                     'cgroup_driver': 'unknown'
                 }
         
-        # Check for jq for JSON parsing
-        has_jq, _ = self.execute_command("command -v jq")
-        
-        # Get list of running containers with resources
-        if has_jq:
-            output, _ = self.execute_command("""
-                docker ps --format '{{json .}}' | jq -s '.'
-            """)
-        else:
-            # Alternative method without jq
-            output, _ = self.execute_command("""
-                echo "["
-                docker ps --format '{{json .}}' | sed -e 's/$/,/'
-                echo "{}"
-                echo "]"
-            """)
-            # Fix JSON format (remove extra comma)
-            if output:
-                output = output.replace(",\n{}\n]", "\n]")
-        
-        if output and output != "null":
-            try:
-                containers = json.loads(output)
-                for container in containers:
-                    container_name = container.get('Names', '')
-                    # Get resource usage for container
-                    stats_output, _ = self.execute_command(f"""
-                        docker stats {container_name} --no-stream --format '{{{{json .}}}}'
-                    """)
-                    
-                    if stats_output:
-                        try:
-                            stats = json.loads(stats_output)
-                            container['stats'] = stats
-                        except json.JSONDecodeError:
-                            container['stats'] = {}
-                    
-                    # Get resource limits for container
-                    inspect_output, _ = self.execute_command(f"""
-                        docker inspect {container_name} --format '{{{{json .HostConfig}}}}'
-                    """)
-                    
-                    if inspect_output:
-                        try:
-                            host_config = json.loads(inspect_output)
-                            container['limits'] = {
-                                'cpu': host_config.get('CpuShares', 0),
-                                'memory': host_config.get('Memory', 0)
-                            }
-                        except json.JSONDecodeError:
-                            container['limits'] = {}
-                            
-                    self.info['docker']['containers']['running'].append(container)
-            except json.JSONDecodeError:
-                pass
+        # Lists of running containers, all containers and images
+        self.info['docker']['containers']['running'] = self._parse_json_lines(sections.get('containers_running'))
+        self.info['docker']['containers']['all'] = self._parse_json_lines(sections.get('containers_all'))
+        self.info['docker']['images'] = self._parse_json_lines(sections.get('images'))
             
-        # Get list of all containers
-        if has_jq:
-            output, _ = self.execute_command("""
-                docker ps -a --format '{{json .}}' | jq -s '.'
-            """)
-        else:
-            # Alternative method without jq
-            output, _ = self.execute_command("""
-                echo "["
-                docker ps -a --format '{{json .}}' | sed -e 's/$/,/'
-                echo "{}"
-                echo "]"
-            """)
-            # Fix JSON format (remove extra comma)
-            if output:
-                output = output.replace(",\n{}\n]", "\n]")
-        
-        if output and output != "null":
+        # Resource usage and limits of the running containers
+        self._parse_container_details(sections)
+    
+    @staticmethod
+    def _parse_json_lines(output):
+        """Parse docker --format '{{json .}}' output with one JSON object per line."""
+        items = []
+        for line in (output or '').split('\n'):
+            if line:
+                try:
+                    items.append(json_utils.loads(line))
+                except json.JSONDecodeError:
+                    pass
+        return items
+    
+    def _parse_container_details(self, sections):
+        """Add resource usage and limits from batched output to each running container."""
+        # Resource usage of all running containers, one JSON object per line
+        stats_by_name = {}
+        for line in (sections.get('container_stats') or '').split('\n'):
             try:
-                self.info['docker']['containers']['all'] = json.loads(output)
+                stats = json_utils.loads(line)
             except json.JSONDecodeError:
-                pass
+                continue
+            stats_by_name[stats.get('Name')] = stats
             
-        # Get list of images
-        if has_jq:
-            output, _ = self.execute_command("""
-                docker images --format '{{json .}}' | jq -s '.'
-            """)
-        else:
-            # Alternative method without jq
-            output, _ = self.execute_command("""
-                echo "["
-                docker images --format '{{json .}}' | sed -e 's/$/,/'
-                echo "{}"
-                echo "]"
-            """)
-            # Fix JSON format (remove extra comma)
-            if output:
-                output = output.replace(",\n{}\n]", "\n]")
-        
-        if output and output != "null":
+        # Resource limits, one "/name cpu_shares memory" line per running container
+        limits_by_name = {}
+        for line in (sections.get('container_limits') or '').split('\n'):
+            fields = line.split()
+            if len(fields) != 3:
+                continue
+            name, cpu_shares, memory = fields
             try:
-                self.info['docker']['images'] = json.loads(output)
-            except json.JSONDecodeError:
-                pass
+                limits_by_name[name.lstrip('/')] = {
+                    'cpu': int(cpu_shares),
+                    'memory': int(memory)
+                }
+            except ValueError:
+                continue
+            
+        for container in self.info['docker']['containers']['running']:
+            container_name = container.get('Names', '')
+            if container_name in stats_by_name:
+                container['stats'] = stats_by_name[container_name]
+            if container_name in limits_by_name:
+                container['limits'] = limits_by_name[container_name]
     
     def collect_all_info(self):
-        """Collect all server information."""
-        if not self.connect():
+        """Collect all server information.
+        
+        All commands are sent as one batch over the already open SSH session
+        if there is one; otherwise the connection is opened and closed around
+        the collection.
+        """
+        owns_connection = not self._is_connected()
+        if owns_connection and not self.connect():
             return False
             
+        self._summary = None
         try:
-            self.collect_system_info()
-            self.collect_resource_info()
-            self.collect_docker_info()
+            self._parse_combined(self.execute_batch_cached(self.ALL_COMMANDS))
             return True
         finally:
-            self.disconnect()
+            if owns_connection:
+                self.disconnect()
     
-    def format_bytes(self, size_bytes):
+    @staticmethod
+    def format_bytes(size_bytes):
         """Convert bytes to human-readable format."""
         if size_bytes == 0 or size_bytes is None:
             return "0B"
@@ -426,17 +703,26 @@ class ServerInfo:
             except (ValueError, TypeError):
                 return size_bytes  # Return as is if we can't convert
         
-        size_names = ("B", "KB", "MB", "GB", "TB", "PB")
-        i = 0
-        while size_bytes >= 1024 and i < len(size_names) - 1:
-            size_bytes /= 1024
-            i += 1
+        if not size_bytes >= 1024:  # Written this way so that NaN is also left in bytes
+            return f"{round(size_bytes, 2)}B"
+        
+        # Every unit is 2**10 times the previous one, so the unit index follows from the bit length
+        if size_bytes >= BYTE_DIVISORS[-1]:
+            i = len(BYTE_UNITS) - 1
+        else:
+            i = (int(size_bytes).bit_length() - 1) // 10
         
         # Round to 2 decimal places
-        return f"{round(size_bytes, 2)}{size_names[i]}"
+        return f"{round(size_bytes / BYTE_DIVISORS[i], 2)}{BYTE_UNITS[i]}"
     
     def get_summary(self):
-        """Get summary information about the server."""
+        """Get summary information about the server (computed once and cached)."""
+        if self._summary is None:
+            self._summary = self._build_summary()
+        return self._summary
+    
+    def _build_summary(self):
+        """Build summary information about the server."""
         if not self.is_available:
             return {
                 'hostname': self.hostname,
@@ -450,34 +736,37 @@ class ServerInfo:
                 'containers_total': 'N/A'
             }
             
-        memory = self.info.get('resources', {}).get('memory', {})
-        memory_usage = f"{self.format_bytes(memory.get('used', 0))}/{self.format_bytes(memory.get('total', 0))}"
+        # Look up the nested sections once and reuse local references below
+        resources = self.info.get('resources') or {}
+        memory = resources.get('memory') or {}
+        disk = resources.get('disk') or {}  # Root disk or first available disk
+        cpu_load = resources.get('cpu_load') or {}
+        docker_info = (self.info.get('docker') or {}).get('info') or {}
+        format_bytes = self.format_bytes
+        
+        memory_usage = f"{format_bytes(memory.get('used', 0))}/{format_bytes(memory.get('total', 0))}"
         memory_percent = memory.get('usage_percent', 0)
         if isinstance(memory_percent, (int, float)):
             memory_percent = f"{memory_percent:.2f}%"
         else:
             memory_percent = f"{memory_percent}%"
         
-        # Get root disk or first available disk for summary
-        disk = self.info.get('resources', {}).get('disk', {})
-        disk_usage = f"{self.format_bytes(disk.get('used', 0))}/{self.format_bytes(disk.get('total', 0))}"
+        disk_usage = f"{format_bytes(disk.get('used', 0))}/{format_bytes(disk.get('total', 0))}"
         disk_percent = disk.get('usage_percent', 0)
         if isinstance(disk_percent, (int, float)):
             disk_percent = f"{disk_percent:.2f}%"
         else:
             disk_percent = f"{disk_percent}%"
         
-        docker_info = self.info.get('docker', {}).get('info', {})
-        
         # Format CPU usage
-        cpu_usage = self.info.get('resources', {}).get('cpu_usage_current', 0)
+        cpu_usage = resources.get('cpu_usage_current', 0)
         if isinstance(cpu_usage, (int, float)):
             cpu_usage_str = f"{cpu_usage:.1f}%"
         else:
             cpu_usage_str = f"{cpu_usage}%"
         
         # Format Load Average
-        cpu_load_relative = self.info.get('resources', {}).get('cpu_load_relative', {}).get('load_5m_percent', 0)
+        cpu_load_relative = (resources.get('cpu_load_relative') or {}).get('load_5m_percent', 0)
         if isinstance(cpu_load_relative, (int, float)):
             cpu_load_str = f"{cpu_load_relative:.2f}%"
         else:
@@ -488,11 +777,11 @@ class ServerInfo:
             'port': self.port,
             'status': 'available',
             'cpu_usage': cpu_usage_str,
-            'cpu_load_1m': self.info.get('resources', {}).get('cpu_load', {}).get('load_1m', 'N/A'),
-            'cpu_load_5m': self.info.get('resources', {}).get('cpu_load', {}).get('load_5m', 'N/A'),
-            'cpu_load_15m': self.info.get('resources', {}).get('cpu_load', {}).get('load_15m', 'N/A'),
+            'cpu_load_1m': cpu_load.get('load_1m', 'N/A'),
+            'cpu_load_5m': cpu_load.get('load_5m', 'N/A'),
+            'cpu_load_15m': cpu_load.get('load_15m', 'N/A'),
             'cpu_load_relative': cpu_load_str,
-            'cpu_cores': self.info.get('resources', {}).get('cpu_cores', 'N/A'),
+            'cpu_cores': resources.get('cpu_cores', 'N/A'),
             'memory_usage': memory_usage,
             'memory_percent': memory_percent,
             'disk_usage': disk_usage,
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Module for collecting information about servers via SSH with asyncssh.
+"""
+
+import os
+import socket
+import asyncio
+
+from server_info import ServerInfo, CONNECT_TIMEOUT, COMMAND_TIMEOUT
+
+class ServerInfoAsync(ServerInfo):
+    """ServerInfo that talks to the server through asyncssh coroutines.
+    
+    Many servers can be collected concurrently on one event loop instead of
+    one thread per connection. Commands, parsing and summaries are shared with
+    ServerInfo; only connecting and running commands differ.
+    """
+    
+    __slots__ = ('_conn',)
+    
+    def __init__(self, *args, **kwargs):
+        """Initialization with the same connection parameters as ServerInfo."""
+        super().__init__(*args, **kwargs)
+        self._conn = None
+    
+    def __getstate__(self):
+        """State for pickling without the asyncssh connection."""
+        state = super().__getstate__()
+        state['_conn'] = None
+        return state
+    
+    async def connect(self):
+        """Establish SSH connection to the server."""
+        import asyncssh  # Optional dependency, only needed for this backend
+        
+        self._summary = None
+        connect_args = {
+            'port': self.port,
+            'known_hosts': None,  # Same as AutoAddPolicy of the paramiko backend
+            'connect_timeout': CONNECT_TIMEOUT,
+            'compression_algs': ('zlib@openssh.com', 'none')  # Prefer compression like the paramiko backend
+        }
+        
+        if self.username:
+            connect_args['username'] = self.username
+        
+        if self.key_file:
+            # A missing key file falls back to the agent and default keys, as with the other backends
+            if os.path.exists(os.path.expanduser(self.key_file)):
+                connect_args['client_keys'] = [os.path.expanduser(self.key_file)]
+        
+        if self.password:
+            connect_args['password'] = self.password
+        
+        try:
+            # The host name, so that every address it resolves to is tried in turn
+            self._conn = await asyncssh.connect(self.hostname, **connect_args)
+            self.is_available = True
+            return True
+        except (socket.gaierror, UnicodeError) as e:
+            self.error_message = f"Name resolution error: {str(e)}"
+            return False
+        except asyncio.TimeoutError:
+            self.error_message = "Connection timeout"
+            return False
+        except asyncssh.PermissionDenied:
+            self.error_message = "Authentication error"
+            return False
+        except asyncssh.Error as e:
+            self.error_message = f"SSH error: {str(e)}"
+            return False
+        except Exception as e:
+            self.error_message = f"Connection error: {str(e)}"
+            return False
+    
+    def _is_connected(self):
+        """Check whether connect() has been called without a disconnect() since."""
+        return self._conn is not None
+    
+    async def disconnect(self):
+        """Close SSH connection."""
+        if self._conn is not None:
+            self._conn.close()
+            await self._conn.wait_closed()
+            self._conn = None
+    
+    async def execute_command(self, command, expect_exit=True):
+        """Execute command on server and return result (see ServerInfo.execute_command)."""
+        if not self.is_available:
+            return None, f"Server unavailable: {self.error_message}"
+        
+        try:
+            result = await asyncio.wait_for(
+                self._conn.run(command, check=False, encoding='utf-8', errors='replace'),
+                COMMAND_TIMEOUT
+            )
+            return self._command_result((result.stdout or '').strip(), (result.stderr or '').strip(),
+                                        result.exit_status if expect_exit else 0)
+        except Exception as e:
+            return None, f"Error executing command '{command}': {str(e)}"
+    
+    async def execute_batch(self, commands):
+        """Execute several commands in a single SSH exec (see ServerInfo.execute_batch)."""
+        output, _ = await self.execute_command(self._batch_script(commands), expect_exit=False)
+        return self._split_sections(output) if output else {}
+    
+    async def execute_batch_cached(self, commands):
+        """Same as execute_batch(), but sections in CACHE_TTLS are reused until they expire."""
+        sections, pending, now = self._cached_sections(commands)
+        if pending:
+            self._store_cached(sections, await self.execute_batch(pending), now)
+        return sections
+    
+    async def collect_system_info(self):
+        """Collect general system information."""
+        if not self.is_available:
+            return
+        
+        self._parse_system_info(await self.execute_batch_cached(self.SYSTEM_COMMANDS))
+    
+    async def collect_resource_info(self):
+        """Collect resource information."""
+        if not self.is_available:
+            return
+        
+        self._parse_resource_info(await self.execute_batch(self.RESOURCE_COMMANDS))
+    
+    async def collect_docker_info(self):
+        """Collect information about Docker and containers."""
+        if not self.is_available:
+            return
+        
+        self._parse_docker_info(await self.execute_batch_cached(self.DOCKER_COMMANDS))
+    
+    async def collect_all_info(self):
+        """Collect all server information with one batch of commands."""
+        owns_connection = not self._is_connected()
+        if owns_connection and not await self.connect():
+            return False
+        
+        self._summary = None
+        try:
+            self._parse_combined(await self.execute_batch_cached(self.ALL_COMMANDS))
+            return True
+        finally:
+            if owns_connection:
+                await self.disconnect()
\ No newline at end of file
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Module for collecting information about servers via the local OpenSSH client.
+"""
+
+import os
+import subprocess
+
+from server_info import ServerInfo, CONNECT_TIMEOUT, COMMAND_TIMEOUT, _parse_target
+
+# Socket of the shared master connection; %C is a hash of the host, port and user.
+# It lives in the user's private ssh directory, where other users cannot plant or reach it.
+CONTROL_DIR = "~/.ssh"
+CONTROL_PATH = os.path.join(CONTROL_DIR, "docker_resources_%C")
+CONTROL_PERSIST = "60s"  # How long an idle master connection is kept for the next run
+
+class ServerInfoOpenSSH(ServerInfo):
+    """ServerInfo that runs commands through the ssh binary with connection sharing.
+    
+    The first connection to a host starts an OpenSSH master that stays in the
+    background for CONTROL_PERSIST; later commands and runs within that time
+    reuse it without a new handshake. Settings from ~/.ssh/config apply.
+    Commands, parsing and summaries are shared with ServerInfo.
+    """
+    
+    __slots__ = ('_ssh_port',)
+    
+    # ssh resolves the name itself: Host aliases and ProxyJump hosts may not be reachable directly
+    RESOLVE_BEFORE_CONNECT = False
+    
+    def __init__(self, hostname, username=None, port=None, **kwargs):
+        """Initialization with the same parameters as ServerInfo; the port defaults to the ssh config."""
+        super().__init__(hostname, username=username, port=22 if port is None else port, **kwargs)
+        # Only a port given in the server string or as an argument goes on the ssh command line
+        if isinstance(hostname, str):
+            self._ssh_port = _parse_target(hostname, port, None)[1]
+        else:
+            self._ssh_port = self.port
+    
+    def __getstate__(self):
+        """State for pickling, including the explicitly given port."""
+        state = super().__getstate__()
+        state['_ssh_port'] = self._ssh_port
+        return state
+    
+    def _ssh_args(self):
+        """Command line of the ssh client for this server, without the remote command."""
+        args = [
+            'ssh',
+            '-o', 'BatchMode=yes',  # Never prompt for passwords or passphrases
+            '-o', f'ConnectTimeout={CONNECT_TIMEOUT}',
+            '-o', 'StrictHostKeyChecking=accept-new',
+            '-o', 'LogLevel=ERROR',
+            '-o', 'ControlMaster=auto',
+            '-o', f'ControlPath={os.path.expanduser(CONTROL_PATH)}',
+            '-o', f'ControlPersist={CONTROL_PERSIST}'
+        ]
+        
+        # Port and user only when given explicitly, otherwise ssh takes them from its config
+        if self._ssh_port is not None:
+            args += ['-p', str(self._ssh_port)]
+        
+        if self.username:
+            args += ['-l', self.username]
+        
+        if self.key_file:
+            if os.path.exists(os.path.expanduser(self.key_file)):
+                args += ['-i', os.path.expanduser(self.key_file)]
+        
+        # The host name as given, so that Host entries of the ssh config match
+        args.append(self.hostname)
+        return args
+    
+    def _run(self, command, timeout):
+        """Run command on the server with the ssh client and return the completed process."""
+        return subprocess.run(self._ssh_args() + [command], stdin=subprocess.DEVNULL,
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=timeout)
+    
+    def _read_config_port(self):
+        """Take the port that ssh will use from its config (ssh -G does not connect) for the report."""
+        args = self._ssh_args()
+        result = subprocess.run(args[:1] + ['-G'] + args[1:], stdin=subprocess.DEVNULL,
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=COMMAND_TIMEOUT)
+        for line in result.stdout.decode('utf-8', errors='replace').split('\n'):
+            name, _, value = line.partition(' ')
+            if name == 'port' and value.isdigit():
+                self.port = int(value)
+                self.info['port'] = self.port
+                break
+    
+    def connect(self):
+        """Establish the master SSH connection to the server (or reuse a running one)."""
+        self._summary = None
+        if self.password:
+            self.error_message = "Connection error: password authentication is not supported by the openssh backend"
+            return False
+        
+        try:
+            # ssh only creates the socket, not the directory; mode 0700 as ssh expects for ~/.ssh
+            os.makedirs(os.path.expanduser(CONTROL_DIR), mode=0o700, exist_ok=True)
+            if self._ssh_port is None:
+                self._read_config_port()
+            result = self._run("true", timeout=COMMAND_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self.error_message = "Connection timeout"
+            return False
+        except OSError as e:
+            self.error_message = f"Connection error: {str(e)}"
+            return False
+        
+        if result.returncode != 0:
+            # ssh exits with 255 on its own errors and prints them to stderr
+            error = result.stderr.decode('utf-8', errors='replace').strip()
+            if 'timed out' in error:
+                self.error_message = "Connection timeout"
+            elif 'Could not resolve hostname' in error:
+                self.error_message = f"Name resolution error: {error}"
+            elif any(reason in error for reason in ('Connection refused', 'No route to host',
+                                                    'Network is unreachable')):
+                self.error_message = f"Connection error: {error}"
+            elif 'Permission denied' in error:
+                self.error_message = "Authentication error"
+            else:
+                self.error_message = f"SSH error: {error or 'exit code ' + str(result.returncode)}"
+            return False
+        
+        self.is_available = True
+        return True
+    
+    def _is_connected(self):
+        """There is no client object; connect() succeeded if the server is available."""
+        return self.is_available
+    
+    def disconnect(self):
+        """Nothing to close: the master connection exits by itself after CONTROL_PERSIST."""
+    
+    def execute_command(self, command, expect_exit=True):
+        """Execute command on server and return result (see ServerInfo.execute_command)."""
+        if not self.is_available:
+            return None, f"Server unavailable: {self.error_message}"
+        
+        try:
+            result = self._run(command, timeout=COMMAND_TIMEOUT)
+            return self._command_result(result.stdout.decode('utf-8', errors='replace').strip(),
+                                        result.stderr.decode('utf-8', errors='replace').strip(),
+                                        result.returncode if expect_exit else 0)
+        except Exception as e:
+            return None, f"Error executing command '{command}': {str(e)}"
\ No newline at end of file
@@ -11,8 +11,11 @@ setup(
     packages=find_packages(),
     install_requires=[
         "paramiko>=3.0.0",
-        "prettytable>=3.0.0",
     ],
+    extras_require={
+        'fast': ["orjson>=3.0"],
+        'async': ["asyncssh>=2.7"],
+    },
     entry_points={
         'console_scripts': [
             'docker-resources=docker_resources:main',
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Module with a pool of SSH connections shared between workers.
+"""
+
+import time
+import threading
+from collections import deque
+
+DEFAULT_MAX_IDLE = 8  # Idle clients kept open at most, every further released client is closed
+DEFAULT_MAX_IDLE_PER_KEY = 2  # Idle clients kept open at most for one server
+DEFAULT_IDLE_TIMEOUT = 60  # Seconds after which an idle client is closed instead of reused
+
+class SSHPool:
+    """Pool of open SSH clients keyed by connection parameters."""
+    
+    def __init__(self, max_idle=DEFAULT_MAX_IDLE, max_idle_per_key=DEFAULT_MAX_IDLE_PER_KEY,
+                 idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        """Initialization of an empty pool with limits on how many clients stay idle and for how long."""
+        self.max_idle = max_idle
+        self.max_idle_per_key = max_idle_per_key
+        self.idle_timeout = idle_timeout
+        self._clients = {}  # key -> deque of (client, release time), the most recently released last
+        self._idle_count = 0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _is_alive(client):
+        """Check that the client's SSH transport is still connected."""
+        transport = client.get_transport()
+        return transport is not None and transport.is_active()
+    
+    def _take_expired(self, key, now):
+        """Remove idle clients of the key that waited longer than idle_timeout and return them.
+        
+        Must be called with the lock held.
+        """
+        idle = self._clients.get(key)
+        expired = []
+        while idle and now - idle[0][1] > self.idle_timeout:
+            expired.append(idle.popleft()[0])
+        self._idle_count -= len(expired)
+        if not idle:
+            self._clients.pop(key, None)
+        return expired
+    
+    def acquire(self, key, factory):
+        """Return a live idle client for the key or open a new one with factory()."""
+        while True:
+            with self._lock:
+                stale = self._take_expired(key, time.monotonic())
+                idle = self._clients.get(key)
+                if idle:
+                    client = idle.pop()[0]
+                    self._idle_count -= 1
+                    if not idle:
+                        del self._clients[key]
+                else:
+                    client = None
+            
+            for stale_client in stale:
+                stale_client.close()
+            
+            if client is None:
+                return factory()
+            if self._is_alive(client):
+                return client
+            
+            # The server or the network dropped this connection while it was idle
+            client.close()
+    
+    def release(self, key, client):
+        """Return client to the pool so the next call for the key can reuse it.
+        
+        The client is closed instead if it is no longer connected or the pool
+        already holds max_idle idle clients (max_idle_per_key for this key),
+        so a long run over many servers does not keep a connection open for
+        each of them.
+        """
+        stale = []
+        if self._is_alive(client):
+            with self._lock:
+                now = time.monotonic()
+                stale = self._take_expired(key, now)
+                idle = self._clients.get(key)
+                if self._idle_count < self.max_idle and (not idle or len(idle) < self.max_idle_per_key):
+                    self._clients.setdefault(key, deque()).append((client, now))
+                    self._idle_count += 1
+                    client = None
+        
+        for stale_client in stale:
+            stale_client.close()
+        if client is not None:
+            client.close()
+    
+    def close_all(self):
+        """Close all pooled clients."""
+        with self._lock:
+            clients = [client for idle in self._clients.values() for client, _ in idle]
+            self._clients.clear()
+            self._idle_count = 0
+        
+        for client in clients:
+            client.close()
\ No newline at end of file